@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Generate a TensorRT INT8 calibration table for the BGE embedding model.
+
+Feeds representative queries through ONNX Runtime's quantization
+calibrator (which augments the graph with min/max collection nodes) and
+writes the resulting table as bge_int8.cache inside the model's
+trt_cache directory, where the TensorRT execution provider resolves
+calibration table names. The Triton backend enables INT8 automatically
+on the next model load when the table is present.
+
+Run once on the GPU host after exporting the model:
+    python calibrate_bge_int8.py [queries.txt]
+"""
+
+import os
+import sys
+import numpy as np
+from pathlib import Path
+
+try:
+    from transformers import AutoTokenizer
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        create_calibrator,
+        write_calibration_table,
+    )
+except ImportError as e:
+    print(f"Missing package: {e}")
+    print("\nInstall required packages:")
+    print("pip install transformers onnxruntime-gpu")
+    sys.exit(1)
+
+MODEL_DIR = Path(__file__).parent / "bge_embeddings" / "1"
+TRT_CACHE_DIR = MODEL_DIR / "trt_cache"
+CALIBRATION_TABLE = "bge_int8.cache"
+NUM_SAMPLES = 500
+BATCH_SIZE = 8
+
+# Fallback corpus when no query file is given - short/medium/long texts
+# spanning the sequence lengths the model actually serves
+DEFAULT_QUERIES = [
+    "What is machine learning?",
+    "How do I set up a Docker container for a Node.js application?",
+    "Explain the difference between GraphQL subscriptions and queries "
+    "and when each is appropriate for real-time collaborative editing.",
+    "Show me an example of a React component using hooks",
+    "What are the best practices for PostgreSQL connection pooling "
+    "in a containerized environment with multiple replicas?",
+]
+
+
+def load_queries(path=None):
+    """Load calibration texts from a file or repeat the default corpus"""
+    if path:
+        texts = [line.strip() for line in Path(path).read_text().splitlines() if line.strip()]
+    else:
+        texts = DEFAULT_QUERIES
+    # Repeat to reach the target sample count
+    while len(texts) < NUM_SAMPLES:
+        texts = texts + texts
+    return texts[:NUM_SAMPLES]
+
+
+class BgeCalibrationDataReader(CalibrationDataReader):
+    """Serves tokenized query batches to the calibrator"""
+
+    def __init__(self, tokenizer, queries):
+        self.tokenizer = tokenizer
+        self.queries = queries
+        self.index = 0
+
+    def get_next(self):
+        if self.index >= len(self.queries):
+            return None
+        batch = self.queries[self.index:self.index + BATCH_SIZE]
+        self.index += BATCH_SIZE
+        inputs = self.tokenizer(
+            batch,
+            padding=True,
+            truncation=True,
+            max_length=512,
+            return_tensors="np"
+        )
+        return {
+            "input_ids": inputs["input_ids"].astype(np.int64),
+            "attention_mask": inputs["attention_mask"].astype(np.int64)
+        }
+
+    def rewind(self):
+        self.index = 0
+
+
+def calibrate(queries):
+    """Collect activation ranges and write the INT8 calibration table"""
+    model_path = MODEL_DIR / "model.onnx"
+    if not model_path.exists():
+        print(f"Model not found: {model_path}")
+        print("Run export_bge_onnx.py first.")
+        sys.exit(1)
+
+    tokenizer = AutoTokenizer.from_pretrained(str(MODEL_DIR))
+    reader = BgeCalibrationDataReader(tokenizer, queries)
+
+    augmented_path = MODEL_DIR / "augmented_model.onnx"
+    calibrator = create_calibrator(
+        str(model_path),
+        op_types_to_calibrate=None,
+        augmented_model_path=str(augmented_path),
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    calibrator.set_execution_providers(["CUDAExecutionProvider", "CPUExecutionProvider"])
+
+    print(f"Calibrating with {len(queries)} samples...")
+    calibrator.collect_data(reader)
+    try:
+        ranges = calibrator.compute_data()
+    except AttributeError:
+        # onnxruntime < 1.16 names this compute_range()
+        ranges = calibrator.compute_range()
+
+    # write_calibration_table emits calibration.flatbuffers (the format
+    # the TensorRT EP reads) into the working directory; the EP resolves
+    # trt_int8_calibration_table_name relative to the engine cache dir,
+    # so place the renamed table there
+    TRT_CACHE_DIR.mkdir(exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(TRT_CACHE_DIR)
+    try:
+        write_calibration_table(ranges)
+        os.replace("calibration.flatbuffers", CALIBRATION_TABLE)
+        for leftover in ("calibration.cache", "calibration.json"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    finally:
+        os.chdir(cwd)
+    if augmented_path.exists():
+        augmented_path.unlink()
+
+    table = TRT_CACHE_DIR / CALIBRATION_TABLE
+    if table.exists():
+        print(f"\n✓ Calibration table written: {table}")
+    else:
+        print("\nCalibration table was not produced - check the "
+              "onnxruntime.quantization version.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    query_file = sys.argv[1] if len(sys.argv) > 1 else None
+    calibrate(load_queries(query_file))
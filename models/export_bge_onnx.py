@@ -14,18 +14,58 @@ from pathlib import Path
 
 # Check for required packages
 try:
+    import onnx
+    from onnxconverter_common.float16 import convert_float_to_float16
     from transformers import AutoTokenizer, AutoModel
     from optimum.onnxruntime import ORTModelForFeatureExtraction
     from optimum.exporters.onnx import main_export
 except ImportError as e:
     print(f"Missing package: {e}")
     print("\nInstall required packages:")
-    print("pip install transformers optimum[onnxruntime-gpu] onnx onnxruntime-gpu sentence-transformers")
+    print("pip install transformers optimum[onnxruntime-gpu] onnx onnxconverter-common onnxruntime-gpu sentence-transformers")
     sys.exit(1)
 
 MODEL_NAME = "BAAI/bge-base-en-v1.5"
 OUTPUT_DIR = Path(__file__).parent / "bge_embeddings" / "1"
 
+
+def append_pooling_nodes(model):
+    """Fuse masked mean pooling + L2 normalization into the ONNX graph.
+
+    Adds a 'sentence_embedding' output computed from the hidden states and
+    attention_mask, so the runtime gets the final normalized embedding
+    directly and TensorRT can fuse the pooling into the last layers instead
+    of the Python backend doing it on host after a D2H copy.
+    """
+    from onnx import helper, numpy_helper, TensorProto
+
+    graph = model.graph
+    hidden_out = graph.output[0].name  # last_hidden_state [B, S, H]
+    hidden_size = graph.output[0].type.tensor_type.shape.dim[2].dim_value or 768
+
+    graph.initializer.extend([
+        numpy_helper.from_array(np.array([1], dtype=np.int64), "pool_axes_seq"),
+        numpy_helper.from_array(np.array([2], dtype=np.int64), "pool_axes_unsqueeze"),
+        numpy_helper.from_array(np.array(1e-9, dtype=np.float32), "pool_count_min"),
+    ])
+
+    graph.node.extend([
+        helper.make_node("Cast", ["attention_mask"], ["pool_mask_f"], to=TensorProto.FLOAT),
+        helper.make_node("Unsqueeze", ["pool_mask_f", "pool_axes_unsqueeze"], ["pool_mask_exp"]),
+        helper.make_node("Mul", [hidden_out, "pool_mask_exp"], ["pool_masked_hidden"]),
+        helper.make_node("ReduceSum", ["pool_masked_hidden", "pool_axes_seq"],
+                         ["pool_sum_embeddings"], keepdims=0),
+        helper.make_node("ReduceSum", ["pool_mask_f", "pool_axes_seq"],
+                         ["pool_counts"], keepdims=1),
+        helper.make_node("Clip", ["pool_counts", "pool_count_min"], ["pool_counts_safe"]),
+        helper.make_node("Div", ["pool_sum_embeddings", "pool_counts_safe"], ["pool_mean"]),
+        helper.make_node("LpNormalization", ["pool_mean"], ["sentence_embedding"], axis=1, p=2),
+    ])
+
+    graph.output.append(helper.make_tensor_value_info(
+        "sentence_embedding", TensorProto.FLOAT, ["batch_size", hidden_size]))
+    return model
+
 def export_model():
     """Export BGE model to ONNX format"""
     print(f"Exporting {MODEL_NAME} to ONNX...")
@@ -52,6 +92,26 @@ def export_model():
         print(f"Model file: {model_file}")
         print(f"Model size: {model_file.stat().st_size / 1024 / 1024:.1f} MB")
 
+    # Fuse mean pooling + L2 norm into the graph so the model emits the
+    # final normalized sentence_embedding output directly
+    print("\nFusing pooling and normalization into the graph...")
+    model_pooled = append_pooling_nodes(onnx.load(str(model_file)))
+    onnx.checker.check_model(model_pooled)
+    onnx.save(model_pooled, str(model_file))
+
+    # Convert weights to FP16 on disk - halves file size, page-cache
+    # residency, and the PCIe transfer during session construction.
+    # keep_io_types=True preserves int64 input_ids/attention_mask and
+    # FP32 outputs, so the Triton backend needs no changes.
+    print("\nConverting weights to FP16...")
+    model_fp16 = convert_float_to_float16(
+        onnx.load(str(model_file)),
+        keep_io_types=True,
+        disable_shape_infer=False,
+    )
+    onnx.save(model_fp16, str(model_file))
+    print(f"FP16 model size: {model_file.stat().st_size / 1024 / 1024:.1f} MB")
+
 
 def test_exported_model():
     """Test the exported ONNX model"""
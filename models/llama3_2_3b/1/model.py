@@ -57,22 +57,60 @@ class TritonPythonModel:
             model_path=str(full_model_path),
             n_gpu_layers=n_gpu_layers,  # -1 = all layers on GPU
             n_ctx=n_ctx,
-            n_batch=512,
+            n_batch=1024,
+            n_ubatch=512,
+            # Fused softmax(QK)V kernel - halves KV-cache read bandwidth,
+            # the dominant cost of the memory-bound decode step
+            flash_attn=True,
+            offload_kqv=True,
+            # Q8_0 KV cache: halves KV memory and bandwidth vs FP16 and is
+            # compatible with flash_attn in llama.cpp's CUDA backend
+            type_k=8,
+            type_v=8,
             verbose=True,
         )
 
         self.logger.log_info(f"Llama model loaded successfully with {n_gpu_layers} GPU layers")
 
+        # Warmup decode: one short eval+sample pass so CUDA kernels are
+        # compiled and the KV cache is allocated before the first request
+        warmup_tokens = self.model.tokenize(b"Hello", add_bos=True)
+        self.model.eval(warmup_tokens)
+        self.model.sample()
+        self.model.reset()
+        self.logger.log_info("Warmup decode complete")
+
         # Default generation parameters
         self.default_max_tokens = 512
         self.default_temperature = 0.7
         self.default_top_p = 0.9
+        # Sampling truncation: an explicit top_k bounds the candidate set
+        # before any cumulative sort, and min_p prunes the tail in a single
+        # O(vocab) pass - at 0.7 temperature the tail past these contributes
+        # nothing to output quality
+        self.default_top_k = 40
+        self.default_min_p = 0.05
+
+        # Pre-fill the constant chat-template prefix once and snapshot the
+        # KV cache, so each request only prefills its own user content
+        # instead of re-running the template tokens every time
+        self.prefix_tokens = self.model.tokenize(
+            b"<|begin_of_text|><|start_header_id|>user<|end_header_id|>\n\n",
+            add_bos=False, special=True
+        )
+        self.model.eval(self.prefix_tokens)
+        self.prefix_state = self.model.save_state()
+        self.assistant_header = b"<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+        self.stop_tokens = set(
+            self.model.tokenize(b"<|eot_id|>", add_bos=False, special=True)
+            + self.model.tokenize(b"<|end_of_text|>", add_bos=False, special=True)
+        )
+        self.logger.log_info(f"Chat-template prefix cached ({len(self.prefix_tokens)} tokens)")
 
     def execute(self, requests):
-        """Process inference requests"""
-        responses = []
-
+        """Process inference requests, streaming tokens as they decode"""
         for request in requests:
+            response_sender = request.get_response_sender()
             try:
                 # Get prompt (required)
                 prompt_tensor = pb_utils.get_input_tensor_by_name(request, "text_input")
@@ -87,45 +125,73 @@ class TritonPythonModel:
 
                 self.logger.log_info(f"Generating response for prompt ({len(prompt)} chars)")
 
-                # Format as chat message for instruct model
-                messages = [
-                    {"role": "user", "content": prompt}
-                ]
-
-                # Generate response using chat completion
-                response = self.model.create_chat_completion(
-                    messages=messages,
-                    max_tokens=int(max_tokens),
-                    temperature=float(temperature),
-                    top_p=float(top_p),
-                    stop=["<|eot_id|>", "<|end_of_text|>"],
-                )
-
-                # Extract generated text
-                generated_text = response['choices'][0]['message']['content']
-
-                self.logger.log_info(f"Generated {len(generated_text)} chars")
-
-                # Create output tensor
-                output_tensor = pb_utils.Tensor(
-                    "text_output",
-                    np.array([[generated_text]], dtype=object)
-                )
-
-                inference_response = pb_utils.InferenceResponse(
-                    output_tensors=[output_tensor]
+                # Restore the cached template-prefix KV state, then prefill
+                # only the user content and assistant header
+                self.model.load_state(self.prefix_state)
+                suffix_tokens = self.model.tokenize(
+                    prompt.encode('utf-8') + self.assistant_header,
+                    add_bos=False, special=True
                 )
-                responses.append(inference_response)
+                self.model.eval(suffix_tokens)
+
+                # Sample token-by-token, streaming each decoded chunk as a
+                # separate response instead of buffering the full string.
+                # Incomplete UTF-8 sequences are held back until the next
+                # token completes them.
+                generated_chars = 0
+                byte_buffer = b""
+                for _ in range(int(max_tokens)):
+                    token = self.model.sample(
+                        temp=float(temperature),
+                        top_p=float(top_p),
+                        top_k=self.default_top_k,
+                        min_p=self.default_min_p,
+                        repeat_penalty=1.0,
+                    )
+                    if token in self.stop_tokens:
+                        break
+                    byte_buffer += self.model.detokenize([token])
+                    try:
+                        chunk = byte_buffer.decode('utf-8')
+                        byte_buffer = b""
+                    except UnicodeDecodeError:
+                        self.model.eval([token])
+                        continue
+                    if chunk:
+                        generated_chars += len(chunk)
+                        self._send_chunk(response_sender, chunk)
+                    self.model.eval([token])
+
+                if byte_buffer:
+                    chunk = byte_buffer.decode('utf-8', errors='replace')
+                    generated_chars += len(chunk)
+                    self._send_chunk(response_sender, chunk)
+
+                self.logger.log_info(f"Generated {generated_chars} chars")
+                response_sender.send(
+                    flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
 
             except Exception as e:
                 self.logger.log_error(f"Error during inference: {str(e)}")
-                error_response = pb_utils.InferenceResponse(
-                    output_tensors=[],
-                    error=pb_utils.TritonError(str(e))
+                response_sender.send(
+                    pb_utils.InferenceResponse(
+                        output_tensors=[],
+                        error=pb_utils.TritonError(str(e))
+                    ),
+                    flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL
                 )
-                responses.append(error_response)
 
-        return responses
+        # Decoupled mode: responses go through the senders, not a return
+        return None
+
+    def _send_chunk(self, response_sender, chunk):
+        """Send one decoded text chunk through the decoupled response sender"""
+        output_tensor = pb_utils.Tensor(
+            "text_output",
+            np.array([[chunk]], dtype=object)
+        )
+        response_sender.send(
+            pb_utils.InferenceResponse(output_tensors=[output_tensor]))
 
     def _get_optional_param(self, request, name, default):
         """Get optional parameter from request or use default"""
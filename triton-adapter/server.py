@@ -11,33 +11,139 @@ API Endpoints:
   GET  /health                - Health check with model status
 """
 
+import asyncio
+import itertools
 import os
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Optional, List
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import tritonclient.grpc as grpcclient
-import tritonclient.http as httpclient
 import numpy as np
 
+# Optional gRPC fast path: stubs are generated from adapter.proto at image
+# build time; without them the adapter serves REST only
+try:
+    import grpc
+    import adapter_pb2
+    import adapter_pb2_grpc
+    GRPC_SERVICE_AVAILABLE = True
+except ImportError:
+    GRPC_SERVICE_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configuration
-TRITON_URL = os.environ.get("TRITON_URL", "triton:8001")
 TRITON_GRPC_URL = os.environ.get("TRITON_GRPC_URL", "triton:8002")
-USE_GRPC = os.environ.get("USE_GRPC", "true").lower() == "true"
+# llama3_2_3b runs in decoupled mode, which Triton only serves over the
+# gRPC streaming client - fail fast rather than 500 on every generation
+if os.environ.get("USE_GRPC", "true").lower() != "true":
+    raise RuntimeError(
+        "USE_GRPC=false is not supported: the decoupled llama3_2_3b model "
+        "requires the gRPC streaming client"
+    )
 MODEL_NAME = os.environ.get("MODEL_NAME", "llama3_2_3b")
 PORT = int(os.environ.get("PORT", "8001"))
+# Upper bound on one full generation over the decoupled stream
+STREAM_TIMEOUT = float(os.environ.get("STREAM_TIMEOUT", "300"))
+# Port for the adapter's own gRPC service (the REST port stays on PORT)
+ADAPTER_GRPC_PORT = int(os.environ.get("ADAPTER_GRPC_PORT", "8011"))
+# Number of independent gRPC connections to Triton: spreading streams
+# over several TCP flows avoids HTTP/2 head-of-line blocking and the
+# single-connection congestion-window cap under high concurrency
+TRITON_CHANNELS = int(os.environ.get("TRITON_CHANNELS", "4"))
+# Directory with the model's tokenizer files; when set, the adapter
+# reports exact token counts and rejects over-long prompts up front
+TOKENIZER_DIR = os.environ.get("TOKENIZER_DIR")
+# Model context window, used to pre-validate prompt + max_tokens
+MAX_CTX = int(os.environ.get("MAX_CTX", "4096"))
+
+
+class TritonChannel:
+    """One Triton connection plus its per-channel request state.
+
+    A gRPC channel carries one decoupled stream at a time, so each
+    channel owns its stream lock and its reusable InferInput skeletons -
+    requests on different channels run fully in parallel.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.stream_lock = asyncio.Lock()
+        self.text_input = grpcclient.InferInput("text_input", [1, 1], "BYTES")
+        self.max_tokens_input = grpcclient.InferInput("max_tokens", [1, 1], "INT32")
+        self.max_tokens_buf = np.zeros((1, 1), dtype=np.int32)
+        self.requested_outputs = [grpcclient.InferRequestedOutput("text_output")]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the Triton channel pool once; requests round-robin across
+    the warm connections instead of paying channel setup per call."""
+    # Blocking tritonclient probes run on the default executor; size it
+    # explicitly so refreshes never queue behind each other under load
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
+
+    channels = []
+    try:
+        for _ in range(TRITON_CHANNELS):
+            client = grpcclient.InferenceServerClient(
+                url=TRITON_GRPC_URL,
+                channel_args=[("grpc.use_local_subchannel_pool", 1)]
+            )
+            channels.append(TritonChannel(client))
+    except Exception as e:
+        logger.error(f"Failed to create Triton client pool: {e}")
+        channels = []
+    app.state.triton_channels = channels
+
+    # Load the model's fast tokenizer once so token counts are exact and
+    # oversized prompts are rejected before a wasted Triton call; without
+    # TOKENIZER_DIR (or transformers) the whitespace estimate is used
+    app.state.tokenizer = None
+    if TOKENIZER_DIR:
+        try:
+            from transformers import AutoTokenizer
+            app.state.tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_DIR, use_fast=True)
+            logger.info(f"Tokenizer loaded from {TOKENIZER_DIR}")
+        except Exception as e:
+            logger.warning(f"Tokenizer unavailable, falling back to approximate counts: {e}")
+
+    # Start the gRPC fast path alongside REST when the generated stubs
+    # are present (see adapter.proto / Dockerfile)
+    grpc_server = None
+    if GRPC_SERVICE_AVAILABLE:
+        grpc_server = grpc.aio.server()
+        adapter_pb2_grpc.add_AdapterServicer_to_server(AdapterServicer(), grpc_server)
+        grpc_server.add_insecure_port(f"0.0.0.0:{ADAPTER_GRPC_PORT}")
+        await grpc_server.start()
+        logger.info(f"gRPC service listening on port {ADAPTER_GRPC_PORT}")
+
+    yield
+
+    if grpc_server is not None:
+        await grpc_server.stop(grace=5)
+    for channel in channels:
+        channel.client.close()
+
 
 app = FastAPI(
     title="Triton Adapter",
     description="OpenVINO and OpenAI-compatible API for Triton Inference Server",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan,
+    # orjson serializes the large generated-text bodies in native code
+    # instead of Python's json.dumps
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -56,16 +162,9 @@ class GenerateRequest(BaseModel):
     top_p: float = 0.9
     top_k: int = 50
 
-class GenerateResponse(BaseModel):
-    response: str
-    tokens_generated: int = 0
-    model: str = MODEL_NAME
-
-class HealthResponse(BaseModel):
-    status: str
-    model_loaded: bool
-    triton_url: str
-    model_name: str
+# Responses are built server-side from trusted data and returned as
+# plain dicts: with no response_model, FastAPI hands them straight to
+# orjson instead of running a second Pydantic validation pass
 
 # OpenAI-compatible models
 class ChatMessage(BaseModel):
@@ -80,48 +179,82 @@ class ChatCompletionRequest(BaseModel):
     top_p: float = 0.9
     stream: bool = False
 
-class ChatCompletionChoice(BaseModel):
-    index: int
-    message: ChatMessage
-    finish_reason: str
 
-class ChatCompletionUsage(BaseModel):
-    prompt_tokens: int
-    completion_tokens: int
-    total_tokens: int
+# Round-robin cursor over the channel pool
+_channel_rr = itertools.count()
 
-class ChatCompletionResponse(BaseModel):
-    id: str
-    object: str = "chat.completion"
-    created: int
-    model: str
-    choices: List[ChatCompletionChoice]
-    usage: ChatCompletionUsage
+
+def get_triton_channel():
+    """Return the next channel from the pool, round-robin"""
+    channels = getattr(app.state, "triton_channels", None)
+    if not channels:
+        return None
+    return channels[next(_channel_rr) % len(channels)]
 
 
 def get_triton_client():
-    """Create Triton client (gRPC preferred for performance)"""
-    try:
-        if USE_GRPC:
-            client = grpcclient.InferenceServerClient(url=TRITON_GRPC_URL)
-        else:
-            client = httpclient.InferenceServerClient(url=TRITON_URL)
-        return client
-    except Exception as e:
-        logger.error(f"Failed to create Triton client: {e}")
-        return None
+    """Return a pooled Triton client (for health probes and one-shots)"""
+    channel = get_triton_channel()
+    return channel.client if channel is not None else None
+
+
+class HealthCache:
+    """TTL cache over Triton liveness/readiness probes.
+
+    Inference endpoints and high-frequency health polls share one cached
+    snapshot instead of each paying gRPC round-trips; a failed inference
+    invalidates the cache so the next call revalidates immediately.
+    """
+
+    def __init__(self, ttl: float = 2.0):
+        self.ttl = ttl
+        self.server_live = False
+        self.server_ready = False
+        self.model_ready = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, client):
+        """Re-probe Triton if the cached snapshot has expired"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.ttl:
+                return
+            try:
+                self.server_live = client.is_server_live()
+                self.server_ready = client.is_server_ready()
+                self.model_ready = (
+                    client.is_model_ready(MODEL_NAME) if self.server_ready else False
+                )
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+                self.server_live = False
+                self.server_ready = False
+                self.model_ready = False
+            self._checked_at = now
 
+    def expired(self) -> bool:
+        """True when the cached snapshot needs re-probing"""
+        return time.monotonic() - self._checked_at >= self.ttl
 
-def check_model_ready(client) -> bool:
-    """Check if the model is loaded and ready"""
-    try:
-        if USE_GRPC:
-            return client.is_model_ready(MODEL_NAME)
-        else:
-            return client.is_model_ready(MODEL_NAME)
-    except Exception as e:
-        logger.error(f"Model ready check failed: {e}")
-        return False
+    def invalidate(self):
+        """Force revalidation on the next check"""
+        self._checked_at = 0.0
+
+
+health_cache = HealthCache(ttl=float(os.environ.get("HEALTH_CACHE_TTL", "2.0")))
+
+
+async def check_model_ready(client) -> bool:
+    """Check if the model is loaded and ready (TTL-cached).
+
+    The blocking probe runs on the thread pool so the event loop keeps
+    serving other requests; refresh re-checks the TTL under its lock, so
+    concurrent awaiters still probe Triton only once.
+    """
+    if health_cache.expired():
+        await asyncio.to_thread(health_cache.refresh, client)
+    return health_cache.model_ready
 
 
 def tokenize_prompt(prompt: str) -> np.ndarray:
@@ -131,109 +264,201 @@ def tokenize_prompt(prompt: str) -> np.ndarray:
 
 
 def detokenize_output(output: np.ndarray) -> str:
-    """Convert model output back to text"""
+    """Convert model output back to text.
+
+    Triton BYTES outputs arrive as object arrays of bytes whatever their
+    shape, so decode the first element directly and keep the dtype and
+    type checks out of the per-chunk hot path.
+    """
     try:
-        if output.dtype == object:
-            return output[0][0].decode('utf-8') if isinstance(output[0][0], bytes) else str(output[0][0])
-        else:
-            return str(output.tolist())
+        return bytes(output.reshape(-1)[0]).decode('utf-8')
     except Exception as e:
         logger.error(f"Detokenization error: {e}")
         return str(output)
 
 
-def call_triton(prompt: str, max_tokens: int = 512) -> str:
-    """Call Triton for inference"""
-    client = get_triton_client()
 
-    if client is None:
-        raise HTTPException(status_code=503, detail="Triton server unavailable")
+def _approx_tokens(s: str) -> int:
+    """Whitespace-based token estimate without materializing a word list.
 
-    if not check_model_ready(client):
-        raise HTTPException(status_code=503, detail=f"Model '{MODEL_NAME}' not ready")
+    str.count runs as a single C scan over the buffer, unlike split()
+    which allocates a substring per word just to be counted.
+    """
+    return s.count(' ') + (1 if s else 0)
 
-    prompt_data = tokenize_prompt(prompt)
 
-    if USE_GRPC:
-        inputs = [grpcclient.InferInput("text_input", prompt_data.shape, "BYTES")]
-        inputs[0].set_data_from_numpy(prompt_data)
+def count_tokens(s: str) -> int:
+    """Exact token count via the loaded fast tokenizer, or the
+    whitespace approximation when no tokenizer is configured."""
+    tokenizer = getattr(app.state, "tokenizer", None)
+    if tokenizer is not None:
+        return len(tokenizer.encode(s, add_special_tokens=False))
+    return _approx_tokens(s)
+
 
-        max_tokens_arr = np.array([[max_tokens]], dtype=np.int32)
-        inputs.append(grpcclient.InferInput("max_tokens", max_tokens_arr.shape, "INT32"))
-        inputs[1].set_data_from_numpy(max_tokens_arr)
+_ROLE_PREFIXES = {"system": "System: ", "user": "User: ", "assistant": "Assistant: "}
 
-        outputs = [grpcclient.InferRequestedOutput("text_output")]
 
-        response = client.infer(model_name=MODEL_NAME, inputs=inputs, outputs=outputs)
-        output_data = response.as_numpy("text_output")
-    else:
-        inputs = [httpclient.InferInput("text_input", list(prompt_data.shape), "BYTES")]
-        inputs[0].set_data_from_numpy(prompt_data)
+def format_chat_prompt(messages) -> str:
+    """Join role-prefixed messages into one prompt.
 
-        max_tokens_arr = np.array([[max_tokens]], dtype=np.int32)
-        inputs.append(httpclient.InferInput("max_tokens", list(max_tokens_arr.shape), "INT32"))
-        inputs[1].set_data_from_numpy(max_tokens_arr)
+    The generator feeds join directly, so each formatted line is written
+    once into the final buffer instead of first accumulating in an
+    intermediate list.
+    """
+    prompt = "\n".join(
+        _ROLE_PREFIXES[m.role] + m.content if m.role in _ROLE_PREFIXES else m.content
+        for m in messages
+    )
+    if not prompt.endswith("Assistant:"):
+        prompt += "\nAssistant:"
+    return prompt
 
-        outputs = [httpclient.InferRequestedOutput("text_output")]
 
-        response = client.infer(model_name=MODEL_NAME, inputs=inputs, outputs=outputs)
-        output_data = response.as_numpy("text_output")
+# Queue sentinel marking the end of a decoupled stream
+_STREAM_DONE = object()
 
-    return detokenize_output(output_data)
 
+async def stream_triton(prompt: str, max_tokens: int = 512):
+    """Yield generated text chunks from Triton as they arrive.
+
+    The gRPC path forwards the decoupled model's chunks through an
+    asyncio.Queue so callers can stream them onward; the HTTP fallback
+    yields the full response as one chunk.
+    """
+    channel = get_triton_channel()
+
+    if channel is None:
+        raise HTTPException(status_code=503, detail="Triton server unavailable")
+    client = channel.client
 
-@app.get("/health", response_model=HealthResponse)
+    if not await check_model_ready(client):
+        raise HTTPException(status_code=503, detail=f"Model '{MODEL_NAME}' not ready")
+
+    # With an exact tokenizer loaded, reject prompts that cannot fit the
+    # context window before occupying a Triton stream
+    if getattr(app.state, "tokenizer", None) is not None:
+        if count_tokens(prompt) + max_tokens > MAX_CTX:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Prompt plus max_tokens exceeds the {MAX_CTX}-token context window"
+            )
+
+    prompt_data = tokenize_prompt(prompt)
+
+    # The model runs in decoupled mode and streams text chunks:
+    # stream_infer delivers them on a client thread, and the event
+    # loop consumes them from a queue, staying free to serve other
+    # requests in the meantime
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def on_stream_response(result, error):
+        if error is not None:
+            loop.call_soon_threadsafe(queue.put_nowait, error)
+            return
+        response = result.get_response()
+        final = response.parameters.get("triton_final_response")
+        if final is not None and final.bool_param:
+            loop.call_soon_threadsafe(queue.put_nowait, _STREAM_DONE)
+            return
+        chunk = result.as_numpy("text_output")
+        if chunk is not None:
+            loop.call_soon_threadsafe(queue.put_nowait, detokenize_output(chunk))
+
+    async with channel.stream_lock:
+        # Fill this channel's input skeletons only while holding its lock
+        channel.text_input.set_data_from_numpy(prompt_data)
+        channel.max_tokens_buf[0, 0] = max_tokens
+        channel.max_tokens_input.set_data_from_numpy(channel.max_tokens_buf)
+
+        client.start_stream(callback=on_stream_response)
+        try:
+            client.async_stream_infer(
+                model_name=MODEL_NAME,
+                inputs=[channel.text_input, channel.max_tokens_input],
+                outputs=channel.requested_outputs,
+                enable_empty_final_response=True
+            )
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=STREAM_TIMEOUT)
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail="Triton stream timed out")
+                if item is _STREAM_DONE:
+                    break
+                if isinstance(item, Exception):
+                    health_cache.invalidate()
+                    raise HTTPException(status_code=500, detail=str(item))
+                yield item
+        finally:
+            client.stop_stream()
+
+
+async def call_triton(prompt: str, max_tokens: int = 512) -> str:
+    """Call Triton and collect the streamed chunks into one string"""
+    return "".join([chunk async for chunk in stream_triton(prompt, max_tokens)])
+
+
+if GRPC_SERVICE_AVAILABLE:
+    class AdapterServicer(adapter_pb2_grpc.AdapterServicer):
+        """gRPC fast path: streams generation chunks straight from the
+        shared stream_triton helper, skipping JSON entirely."""
+
+        async def Generate(self, request, context):
+            max_tokens = request.max_new_tokens or 512
+            chunks = []
+            try:
+                async for chunk in stream_triton(request.prompt, max_tokens):
+                    chunks.append(chunk)
+                    yield adapter_pb2.GenerateChunk(text=chunk, done=False)
+            except HTTPException as e:
+                code = grpc.StatusCode.UNAVAILABLE if e.status_code in (503, 504) \
+                    else grpc.StatusCode.INTERNAL
+                await context.abort(code, str(e.detail))
+            # Same count as the REST /generate path, so both entry points
+            # report identical token numbers for the same output
+            yield adapter_pb2.GenerateChunk(
+                text="", done=True, tokens_generated=count_tokens("".join(chunks)))
+
+
+@app.get("/health")
 async def health_check():
     """Health check endpoint matching OpenVINO API."""
     client = get_triton_client()
 
     if client is None:
-        return HealthResponse(
-            status="error",
-            model_loaded=False,
-            triton_url=TRITON_GRPC_URL if USE_GRPC else TRITON_URL,
-            model_name=MODEL_NAME
-        )
+        return {
+            "status": "error",
+            "model_loaded": False,
+            "triton_url": TRITON_GRPC_URL,
+            "model_name": MODEL_NAME
+        }
 
-    try:
-        if USE_GRPC:
-            is_live = client.is_server_live()
-            is_ready = client.is_server_ready()
-        else:
-            is_live = client.is_server_live()
-            is_ready = client.is_server_ready()
-
-        model_ready = check_model_ready(client) if is_ready else False
-
-        return HealthResponse(
-            status="ok" if is_live and is_ready else "degraded",
-            model_loaded=model_ready,
-            triton_url=TRITON_GRPC_URL if USE_GRPC else TRITON_URL,
-            model_name=MODEL_NAME
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthResponse(
-            status="error",
-            model_loaded=False,
-            triton_url=TRITON_GRPC_URL if USE_GRPC else TRITON_URL,
-            model_name=MODEL_NAME
-        )
+    if health_cache.expired():
+        await asyncio.to_thread(health_cache.refresh, client)
+
+    return {
+        "status": "ok" if health_cache.server_live and health_cache.server_ready else "degraded",
+        "model_loaded": health_cache.model_ready,
+        "triton_url": TRITON_GRPC_URL,
+        "model_name": MODEL_NAME
+    }
 
 
-@app.post("/generate", response_model=GenerateResponse)
+@app.post("/generate")
 async def generate(request: GenerateRequest):
     """Text generation endpoint matching OpenVINO API."""
     try:
         logger.info(f"Generating for prompt: {request.prompt[:50]}...")
-        generated_text = call_triton(request.prompt, request.max_new_tokens)
+        generated_text = await call_triton(request.prompt, request.max_new_tokens)
         logger.info(f"Generated {len(generated_text)} chars")
 
-        return GenerateResponse(
-            response=generated_text,
-            tokens_generated=len(generated_text.split()),
-            model=MODEL_NAME
-        )
+        return {
+            "response": generated_text,
+            "tokens_generated": count_tokens(generated_text),
+            "model": MODEL_NAME
+        }
 
     except HTTPException:
         raise
@@ -242,52 +467,39 @@ async def generate(request: GenerateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/v1/chat/completions", response_model=ChatCompletionResponse)
+@app.post("/v1/chat/completions")
 async def chat_completions(request: ChatCompletionRequest):
     """OpenAI-compatible chat completions endpoint."""
     try:
-        # Format messages into a single prompt
-        # For chat models, combine messages with role prefixes
-        prompt_parts = []
-        for msg in request.messages:
-            if msg.role == "system":
-                prompt_parts.append(f"System: {msg.content}")
-            elif msg.role == "user":
-                prompt_parts.append(f"User: {msg.content}")
-            elif msg.role == "assistant":
-                prompt_parts.append(f"Assistant: {msg.content}")
-            else:
-                prompt_parts.append(msg.content)
-
-        prompt = "\n".join(prompt_parts)
-        if not prompt.endswith("Assistant:"):
-            prompt += "\nAssistant:"
+        # Format messages into a single prompt with role prefixes
+        prompt = format_chat_prompt(request.messages)
 
         logger.info(f"Chat completion for {len(request.messages)} messages")
 
-        generated_text = call_triton(prompt, request.max_tokens)
+        generated_text = await call_triton(prompt, request.max_tokens)
 
         # Approximate token counts
-        prompt_tokens = len(prompt.split())
-        completion_tokens = len(generated_text.split())
-
-        return ChatCompletionResponse(
-            id=f"chatcmpl-{int(time.time())}",
-            created=int(time.time()),
-            model=request.model or MODEL_NAME,
-            choices=[
-                ChatCompletionChoice(
-                    index=0,
-                    message=ChatMessage(role="assistant", content=generated_text),
-                    finish_reason="stop"
-                )
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(generated_text)
+
+        return {
+            "id": f"chatcmpl-{int(time.time())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model or MODEL_NAME,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": generated_text},
+                    "finish_reason": "stop"
+                }
             ],
-            usage=ChatCompletionUsage(
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens
-            )
-        )
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
 
     except HTTPException:
         raise
@@ -303,7 +515,7 @@ async def root():
         "name": "Triton Adapter",
         "version": "1.2.0",
         "description": "Multi-API adapter for Triton Inference Server",
-        "triton_url": TRITON_GRPC_URL if USE_GRPC else TRITON_URL,
+        "triton_url": TRITON_GRPC_URL,
         "model": MODEL_NAME,
         "endpoints": {
             "POST /generate": "Text generation (OpenVINO-compatible)",
@@ -329,58 +541,49 @@ class OllamaChatRequest(BaseModel):
     stream: bool = False
     options: Optional[dict] = None
 
-class OllamaChatResponse(BaseModel):
-    model: str
-    created_at: str
-    message: OllamaChatMessage
-    done: bool = True
-    total_duration: int = 0
-    eval_count: int = 0
+# Prebuilt /api/tags body, refreshed on the health-cache TTL: gateway
+# health checks poll this endpoint many times per second and the body
+# only changes when model readiness flips
+_TAGS_CACHE = {"body": None, "ready": None, "ts": 0.0}
+
 
 @app.get("/api/tags")
 async def ollama_tags():
     """Ollama-compatible model list endpoint (used for health check)"""
-    client = get_triton_client()
-    model_ready = client and check_model_ready(client)
-
-    return {
-        "models": [
-            {
-                "name": MODEL_NAME,
-                "model": MODEL_NAME,
-                "modified_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "size": 0,
-                "digest": "triton-adapter",
-                "details": {
-                    "parent_model": "",
-                    "format": "gguf",
-                    "family": "llama",
-                    "parameter_size": "3B",
-                    "quantization_level": "Q4_K_M"
-                }
+    now = time.monotonic()
+    if _TAGS_CACHE["body"] is None or now - _TAGS_CACHE["ts"] > health_cache.ttl:
+        client = get_triton_client()
+        model_ready = bool(client and await check_model_ready(client))
+        if _TAGS_CACHE["body"] is None or model_ready != _TAGS_CACHE["ready"]:
+            _TAGS_CACHE["body"] = {
+                "models": [
+                    {
+                        "name": MODEL_NAME,
+                        "model": MODEL_NAME,
+                        "modified_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                        "size": 0,
+                        "digest": "triton-adapter",
+                        "details": {
+                            "parent_model": "",
+                            "format": "gguf",
+                            "family": "llama",
+                            "parameter_size": "3B",
+                            "quantization_level": "Q4_K_M"
+                        }
+                    }
+                ] if model_ready else []
             }
-        ] if model_ready else []
-    }
+            _TAGS_CACHE["ready"] = model_ready
+        _TAGS_CACHE["ts"] = now
+
+    return _TAGS_CACHE["body"]
 
 @app.post("/api/chat")
 async def ollama_chat(request: OllamaChatRequest):
     """Ollama-compatible chat endpoint"""
     try:
         # Format messages into prompt
-        prompt_parts = []
-        for msg in request.messages:
-            if msg.role == "system":
-                prompt_parts.append(f"System: {msg.content}")
-            elif msg.role == "user":
-                prompt_parts.append(f"User: {msg.content}")
-            elif msg.role == "assistant":
-                prompt_parts.append(f"Assistant: {msg.content}")
-            else:
-                prompt_parts.append(msg.content)
-
-        prompt = "\n".join(prompt_parts)
-        if not prompt.endswith("Assistant:"):
-            prompt += "\nAssistant:"
+        prompt = format_chat_prompt(request.messages)
 
         # Get options
         options = request.options or {}
@@ -389,17 +592,17 @@ async def ollama_chat(request: OllamaChatRequest):
         logger.info(f"Ollama chat for {len(request.messages)} messages")
 
         start_time = time.time()
-        generated_text = call_triton(prompt, max_tokens)
+        generated_text = await call_triton(prompt, max_tokens)
         duration_ns = int((time.time() - start_time) * 1e9)
 
-        return OllamaChatResponse(
-            model=request.model or MODEL_NAME,
-            created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            message=OllamaChatMessage(role="assistant", content=generated_text),
-            done=True,
-            total_duration=duration_ns,
-            eval_count=len(generated_text.split())
-        )
+        return {
+            "model": request.model or MODEL_NAME,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": generated_text},
+            "done": True,
+            "total_duration": duration_ns,
+            "eval_count": count_tokens(generated_text)
+        }
 
     except HTTPException:
         raise
@@ -412,7 +615,7 @@ async def ollama_chat(request: OllamaChatRequest):
 async def triton_health_ready():
     """Triton-native health endpoint for compatibility"""
     client = get_triton_client()
-    if client and check_model_ready(client):
+    if client and await check_model_ready(client):
         return {"status": "ready"}
     raise HTTPException(status_code=503, detail="Not ready")
 
@@ -422,11 +625,10 @@ async def triton_health_live():
     """Triton-native liveness endpoint"""
     client = get_triton_client()
     if client:
-        try:
-            if client.is_server_live():
-                return {"status": "live"}
-        except:
-            pass
+        if health_cache.expired():
+            await asyncio.to_thread(health_cache.refresh, client)
+        if health_cache.server_live:
+            return {"status": "live"}
     raise HTTPException(status_code=503, detail="Not live")
 
 
@@ -437,9 +639,19 @@ if __name__ == "__main__":
     Triton Adapter Starting
     ----------------------------------------
     Port: {PORT}
-    Triton URL: {TRITON_GRPC_URL if USE_GRPC else TRITON_URL}
-    Protocol: {"gRPC" if USE_GRPC else "HTTP"}
+    Triton URL: {TRITON_GRPC_URL}
+    Protocol: gRPC (decoupled streaming)
     Model: {MODEL_NAME}
     ========================================
     """)
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    # uvloop + httptools move the event loop and HTTP parsing into native
+    # code; multiple workers sidestep the GIL for JSON encoding and
+    # validation (each worker builds its own Triton client in lifespan)
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WORKERS", os.cpu_count() or 2)),
+    )